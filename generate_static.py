@@ -4,23 +4,74 @@
 import json
 import os
 import shutil
+import sys
+import tarfile
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # fall back to xz from the stdlib
+    zstandard = None
 
 # Paths
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 DOCS_DIR = os.path.join(PROJECT_ROOT, "docs")
 API_DIR = os.path.join(DOCS_DIR, "api")
+ACUPOINT_API_DIR = os.path.join(API_DIR, "acupoint")
+IMAGES_API_DIR = os.path.join(API_DIR, "images")
+DIAGNOSE_API_DIR = os.path.join(API_DIR, "diagnose")
+
+# Build inputs, used to skip outputs that are already up to date
+GENERATOR_PATH = os.path.abspath(__file__)
+SYMPTOM_DB_PATH = os.path.join(PROJECT_ROOT, "DignoseSource", "acupressure_by_symptom.json")
+ACUPOINT_DATA_PATH = os.path.join(PROJECT_ROOT, "DignoseSource", "acupoint_data.json")
+
+# Generated JSON is minified; set PRETTY=1 to indent it for debugging
+PRETTY_JSON = bool(os.environ.get("PRETTY"))
+
+# Pass --force to rewrite every output regardless of timestamps
+FORCE_REBUILD = "--force" in sys.argv[1:]
+
+# Settings the outputs were last built with; a change (e.g. toggling PRETTY)
+# makes every output out of date
+BUILD_OPTIONS_PATH = os.path.join(DOCS_DIR, ".build_options")
+BUILD_OPTIONS = f"pretty={int(PRETTY_JSON)}\n"
+
+def read_build_options():
+    """Return the settings recorded by the last build, or None if there was none"""
+    try:
+        with open(BUILD_OPTIONS_PATH, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+BUILD_OPTIONS_CHANGED = read_build_options() != BUILD_OPTIONS
+
+# Pass --bundle to also pack docs/ into a single compressed tar
+BUILD_BUNDLE = "--bundle" in sys.argv[1:]
+
+# Image file extensions copied into docs/images
+IMAGE_EXTS = frozenset(('.jpg', '.png', '.gif', '.webp'))
+
+# Below this many files a worker pool costs more than it saves
+PARALLEL_MIN_ITEMS = 64
 
 # Import data
-import sys
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 from acupoint_locator import ACUPOINT_DATA
 
 # Load symptom database
-with open(os.path.join(PROJECT_ROOT, "DignoseSource", "acupressure_by_symptom.json"), 'r', encoding='utf-8') as f:
+with open(SYMPTOM_DB_PATH, 'r', encoding='utf-8') as f:
     SYMPTOM_DB = json.load(f)
 
-# Chinese name mapping
-CODE_TO_CHINESE = {
+# Chinese name mapping (read-only)
+CODE_TO_CHINESE = MappingProxyType({
     "GB30": "环跳穴", "BL23": "肾俞穴", "BL40": "委中穴", "BL60": "昆仑穴",
     "KI3": "太溪穴", "LI4": "合谷穴", "LR3": "太冲穴", "PC6": "内关穴",
     "ST36": "足三里", "SP6": "三阴交", "SP4": "公孙穴", "HT7": "神门穴",
@@ -28,27 +79,126 @@ CODE_TO_CHINESE = {
     "SJ5": "外关穴", "BL2": "攒竹穴", "EX-HN3": "印堂穴", "EX-HN5": "太阳穴",
     "LV3": "太冲穴", "GV20": "百会穴", "CV17": "膻中穴", "LI11": "曲池穴",
     "AURICULAR_SHENMEN": "耳神门"
-}
+})
+
+# Lookups used while building each diagnose file
+CHINESE_NAME_BY_CODE = {code: data.get('chinese_name', '') for code, data in ACUPOINT_DATA.items()}
+SYMPTOM_CODE_ALIASES = {"Auricular Shenmen": "AURICULAR_SHENMEN"}
+SAFE_NAME_TABLE = str.maketrans({' ': '_'})
+
+# Chinese image files are named "<name>[穴]<n>.jpg", so match on the bare name
+CODE_TO_IMAGE_PREFIX = MappingProxyType({code: name.rstrip('穴') for code, name in CODE_TO_CHINESE.items()})
+
+def needs_update(srcs, dst):
+    """Return True if dst is missing or not newer than every source file"""
+    if FORCE_REBUILD or BUILD_OPTIONS_CHANGED or not os.path.exists(dst):
+        return True
+    # Equal mtimes count as stale: coarse timestamps and archive extracts
+    # give outputs and sources the same time
+    dst_mtime = os.stat(dst).st_mtime
+    return any(os.stat(src).st_mtime >= dst_mtime for src in srcs)
+
+def write_bytes(path, data):
+    """Write data to path through a raw file descriptor, bypassing Python's buffered I/O"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def write_json(obj, path):
+    """Serialize obj as UTF-8 JSON (minified unless PRETTY is set) and write it in one call"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+        data = orjson.dumps(obj, option=option)
+    elif PRETTY_JSON:
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    else:
+        data = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    write_bytes(path, data)
+
+def run_batch(func, items):
+    """Apply func to every item, fanning out to worker processes for large batches"""
+    items = list(items)
+    if len(items) < PARALLEL_MIN_ITEMS:
+        return [func(item) for item in items]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, items, chunksize=32))
+
+def link_or_copy(src, dst):
+    """Hardlink src to dst, falling back to a copy across filesystems.
+
+    Returns False if dst was already up to date and nothing was written.
+    """
+    if os.path.exists(dst):
+        if os.path.samefile(src, dst) or not needs_update([src], dst):
+            return False
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except (OSError, NotImplementedError):
+        shutil.copyfile(src, dst)
+    return True
+
+def image_entries(path):
+    """Yield the DirEntry of each image file directly under path"""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS and entry.is_file():
+                yield entry
+
+def copy_image_tree(src, dst):
+    """Mirror the image files directly under src into dst.
+
+    Returns the image names and how many of them were actually written.
+    """
+    # scandir's d_type tells files from directories without a stat() per name
+    wanted = {entry.name for entry in image_entries(src)}
+    copied = []
+    written = 0
+
+    def ignore_non_images(path, names):
+        # Subdirectories are ignored as well, so copytree never descends
+        return [n for n in names if n not in wanted]
+
+    def copy_image(src_file, dst_file):
+        nonlocal written
+        written += link_or_copy(src_file, dst_file)
+        copied.append(os.path.basename(src_file))
+
+    shutil.copytree(src, dst, ignore=ignore_non_images, copy_function=copy_image, dirs_exist_ok=True)
+    return copied, written
 
 def ensure_dirs():
     """Create necessary directories"""
-    os.makedirs(os.path.join(API_DIR, "acupoint"), exist_ok=True)
-    os.makedirs(os.path.join(API_DIR, "images"), exist_ok=True)
-    os.makedirs(os.path.join(API_DIR, "diagnose"), exist_ok=True)
+    os.makedirs(ACUPOINT_API_DIR, exist_ok=True)
+    os.makedirs(IMAGES_API_DIR, exist_ok=True)
+    os.makedirs(DIAGNOSE_API_DIR, exist_ok=True)
     os.makedirs(os.path.join(DOCS_DIR, "images"), exist_ok=True)
     os.makedirs(os.path.join(DOCS_DIR, ".well-known"), exist_ok=True)
 
 def generate_symptoms():
     """Generate symptoms.json"""
+    filepath = os.path.join(API_DIR, "symptoms.json")
+    if not needs_update([SYMPTOM_DB_PATH, GENERATOR_PATH], filepath):
+        print("✓ symptoms.json is up to date")
+        return
+
     symptoms = [s['symptom'] for s in SYMPTOM_DB['symptoms']]
     data = {"count": len(symptoms), "symptoms": symptoms}
 
-    with open(os.path.join(API_DIR, "symptoms.json"), 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_json(data, filepath)
     print(f"✓ Generated symptoms.json ({len(symptoms)} symptoms)")
 
 def generate_acupoints():
     """Generate acupoints.json"""
+    filepath = os.path.join(API_DIR, "acupoints.json")
+    if not needs_update([ACUPOINT_DATA_PATH, GENERATOR_PATH], filepath):
+        print("✓ acupoints.json is up to date")
+        return
+
     acupoints = []
     for code, data in ACUPOINT_DATA.items():
         acupoints.append({
@@ -60,55 +210,73 @@ def generate_acupoints():
 
     result = {"count": len(acupoints), "acupoints": acupoints}
 
-    with open(os.path.join(API_DIR, "acupoints.json"), 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    write_json(result, filepath)
     print(f"✓ Generated acupoints.json ({len(acupoints)} acupoints)")
 
+def write_acupoint_detail(item):
+    """Write the detail file for one (code, data) acupoint entry"""
+    code, data = item
+    filepath = f"{ACUPOINT_API_DIR}{os.sep}{code}.json"
+    if not needs_update([ACUPOINT_DATA_PATH, GENERATOR_PATH], filepath):
+        return False
+
+    result = {"success": True, "acupoint": data}
+    write_json(result, filepath)
+    return True
+
 def generate_acupoint_details():
     """Generate individual acupoint JSON files"""
-    for code, data in ACUPOINT_DATA.items():
-        result = {"success": True, "acupoint": data}
+    written = sum(run_batch(write_acupoint_detail, ACUPOINT_DATA.items()))
+
+    print(f"✓ Generated {written} acupoint detail files ({len(ACUPOINT_DATA) - written} up to date)")
 
-        filepath = os.path.join(API_DIR, "acupoint", f"{code}.json")
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+def write_diagnose_file(symptom_data):
+    """Write the diagnosis result file for one symptom entry"""
+    symptom = symptom_data['symptom']
 
-    print(f"✓ Generated {len(ACUPOINT_DATA)} acupoint detail files")
+    # Create safe filename
+    safe_name = symptom.partition('/')[0].strip().translate(SAFE_NAME_TABLE).lower()
+    filepath = f"{DIAGNOSE_API_DIR}{os.sep}{safe_name}.json"
+    if not needs_update([SYMPTOM_DB_PATH, ACUPOINT_DATA_PATH, GENERATOR_PATH], filepath):
+        return False
+
+    acupoints = []
+    for point in symptom_data['points']:
+        code = SYMPTOM_CODE_ALIASES.get(point['code'], point['code'])
+
+        acupoints.append({
+            "code": code,
+            "name": point['name'],
+            "chinese_name": CHINESE_NAME_BY_CODE.get(code, ''),
+            "location_hint": point.get('location_hint', ''),
+            "notes": point.get('notes', '')
+        })
+
+    result = {
+        "success": True,
+        "symptom": symptom,
+        "acupoints": acupoints
+    }
+
+    write_json(result, filepath)
+    return True
 
 def generate_diagnose_files():
     """Generate diagnosis result files for each symptom"""
-    for symptom_data in SYMPTOM_DB['symptoms']:
-        symptom = symptom_data['symptom']
-
-        # Create safe filename
-        safe_name = symptom.split('/')[0].strip().replace(' ', '_').lower()
-
-        acupoints = []
-        for point in symptom_data['points']:
-            code = point['code']
-            if code == "Auricular Shenmen":
-                code = "AURICULAR_SHENMEN"
-
-            acupoints.append({
-                "code": code,
-                "name": point['name'],
-                "chinese_name": ACUPOINT_DATA.get(code, {}).get('chinese_name', ''),
-                "location_hint": point.get('location_hint', ''),
-                "notes": point.get('notes', '')
-            })
+    written = sum(run_batch(write_diagnose_file, SYMPTOM_DB['symptoms']))
 
-        result = {
-            "success": True,
-            "symptom": symptom,
-            "acupoints": acupoints,
-            "disclaimer": SYMPTOM_DB.get('disclaimer', 'For educational reference only.')
-        }
+    print(f"✓ Generated {written} diagnose files ({len(SYMPTOM_DB['symptoms']) - written} up to date)")
 
-        filepath = os.path.join(API_DIR, "diagnose", f"{safe_name}.json")
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+def generate_disclaimer():
+    """Generate disclaimer.json, shared by every diagnose file"""
+    filepath = os.path.join(API_DIR, "disclaimer.json")
+    if not needs_update([SYMPTOM_DB_PATH, GENERATOR_PATH], filepath):
+        print("✓ disclaimer.json is up to date")
+        return
 
-    print(f"✓ Generated {len(SYMPTOM_DB['symptoms'])} diagnose files")
+    data = {"disclaimer": SYMPTOM_DB.get('disclaimer', 'For educational reference only.')}
+    write_json(data, filepath)
+    print("✓ Generated disclaimer.json")
 
 def copy_images():
     """Copy images to docs folder and generate image index files"""
@@ -117,64 +285,70 @@ def copy_images():
     dst_images = os.path.join(DOCS_DIR, "images")
 
     image_count = 0
+    written = 0
+    indexes = {}
 
-    # Copy scraped images
+    # Copy scraped images, one tree per acupoint code
+    code_entries = []
     if os.path.exists(src_images):
-        for code_dir in os.listdir(src_images):
-            code_path = os.path.join(src_images, code_dir)
-            if os.path.isdir(code_path):
-                dst_code_path = os.path.join(dst_images, code_dir)
-                os.makedirs(dst_code_path, exist_ok=True)
-
-                images_list = []
-                for f in os.listdir(code_path):
-                    if f.endswith(('.jpg', '.png', '.gif', '.webp')):
-                        shutil.copy2(os.path.join(code_path, f), os.path.join(dst_code_path, f))
-                        images_list.append(f"/images/{code_dir}/{f}")
-                        image_count += 1
-
-                # Generate image index for this acupoint
-                index_data = {"code": code_dir, "images": images_list, "count": len(images_list)}
-                with open(os.path.join(API_DIR, "images", f"{code_dir}.json"), 'w', encoding='utf-8') as f:
-                    json.dump(index_data, f, ensure_ascii=False, indent=2)
+        with os.scandir(src_images) as entries:
+            code_entries = [e for e in entries if e.is_dir()]
+
+    for code_entry in code_entries:
+        code_dir = code_entry.name
+        copied, code_written = copy_image_tree(code_entry.path, os.path.join(dst_images, code_dir))
+        images_list = [f"/images/{code_dir}/{name}" for name in copied]
+        image_count += len(copied)
+        written += code_written
+
+        # Image index for this acupoint, written once Chinese images are merged in
+        indexes[code_dir] = {"code": code_dir, "images": images_list, "count": len(images_list)}
 
     # Copy Chinese images
     chinese_dst = os.path.join(dst_images, "chinese")
     os.makedirs(chinese_dst, exist_ok=True)
 
+    # Record the copied names once; the index loop below reuses them
+    chinese_files = []
     if os.path.exists(chinese_images):
-        for f in os.listdir(chinese_images):
-            if f.endswith(('.jpg', '.png', '.gif', '.webp')):
-                shutil.copy2(os.path.join(chinese_images, f), os.path.join(chinese_dst, f))
-                image_count += 1
+        for entry in image_entries(chinese_images):
+            written += link_or_copy(entry.path, os.path.join(chinese_dst, entry.name))
+            chinese_files.append(entry.name)
+    image_count += len(chinese_files)
+
+    # Group Chinese images under every acupoint name prefix they start with
+    wanted_prefixes = set(CODE_TO_IMAGE_PREFIX.values())
+    longest_prefix = max(map(len, wanted_prefixes))
+    files_by_prefix = {}
+    for f in chinese_files:
+        for end in range(1, min(len(f), longest_prefix) + 1):
+            if f[:end] in wanted_prefixes:
+                files_by_prefix.setdefault(f[:end], []).append(f)
 
     # Update image indexes with Chinese images
-    for code, chinese_name in CODE_TO_CHINESE.items():
-        index_path = os.path.join(API_DIR, "images", f"{code}.json")
-
-        if os.path.exists(index_path):
-            with open(index_path, 'r', encoding='utf-8') as f:
-                index_data = json.load(f)
-        else:
-            index_data = {"code": code, "images": [], "count": 0}
+    for code, prefix in CODE_TO_IMAGE_PREFIX.items():
+        index_data = indexes.setdefault(code, {"code": code, "images": [], "count": 0})
 
         # Add Chinese images
-        if os.path.exists(chinese_images):
-            for f in os.listdir(chinese_images):
-                if f.startswith(chinese_name.rstrip('穴')) and f.endswith(('.jpg', '.png', '.gif', '.webp')):
-                    img_path = f"/images/chinese/{f}"
-                    if img_path not in index_data["images"]:
-                        index_data["images"].append(img_path)
+        for f in files_by_prefix.get(prefix, []):
+            img_path = f"/images/chinese/{f}"
+            if img_path not in index_data["images"]:
+                index_data["images"].append(img_path)
 
         index_data["count"] = len(index_data["images"])
 
-        with open(index_path, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, ensure_ascii=False, indent=2)
+    for code, index_data in indexes.items():
+        write_json(index_data, f"{IMAGES_API_DIR}{os.sep}{code}.json")
 
-    print(f"✓ Copied {image_count} images")
+    print(f"✓ Copied {written} images ({image_count - written} up to date)")
 
 def generate_chat_mapping():
     """Generate keyword to symptom mapping for static chat"""
+    filepath = os.path.join(API_DIR, "keyword_mapping.json")
+    if not needs_update([GENERATOR_PATH], filepath):
+        print("✓ keyword_mapping.json is up to date")
+        return
+
     mapping = {
         "headache": "headache",
         "头痛": "headache",
@@ -212,36 +386,12 @@ def generate_chat_mapping():
         "vomit": "nausea"
     }
 
-    with open(os.path.join(API_DIR, "keyword_mapping.json"), 'w', encoding='utf-8') as f:
-        json.dump(mapping, f, ensure_ascii=False, indent=2)
+    write_json(mapping, filepath)
 
     print("✓ Generated keyword_mapping.json")
 
-def generate_plugin_files():
-    """Generate ChatGPT plugin manifest and OpenAPI spec"""
-
-    # ai-plugin.json - needs to be updated by user with their domain
-    plugin_manifest = {
-        "schema_version": "v1",
-        "name_for_human": "穴位诊断助手",
-        "name_for_model": "acupressure_diagnosis",
-        "description_for_human": "输入症状，获取穴位按摩建议和位置图片。",
-        "description_for_model": "This plugin helps users find acupressure points based on symptoms. When a user describes pain or discomfort, use this plugin to get recommended acupoints with location images. Endpoints: /api/symptoms.json for symptom list, /api/diagnose/{symptom}.json for diagnosis, /api/images/{code}.json for acupoint images.",
-        "auth": {"type": "none"},
-        "api": {
-            "type": "openapi",
-            "url": "https://YOUR_USERNAME.github.io/YOUR_REPO/openapi.yaml"
-        },
-        "logo_url": "https://YOUR_USERNAME.github.io/YOUR_REPO/logo.png",
-        "contact_email": "your@email.com",
-        "legal_info_url": "https://YOUR_USERNAME.github.io/YOUR_REPO/"
-    }
-
-    with open(os.path.join(DOCS_DIR, ".well-known", "ai-plugin.json"), 'w', encoding='utf-8') as f:
-        json.dump(plugin_manifest, f, ensure_ascii=False, indent=2)
-
-    # OpenAPI spec for static files
-    openapi_spec = """openapi: 3.0.1
+# OpenAPI spec for static files
+OPENAPI_SPEC = """openapi: 3.0.1
 info:
   title: 穴位诊断助手 API (Static)
   description: 根据症状推荐穴位按摩方案，提供穴位位置图片 (静态托管版本)
@@ -265,6 +415,14 @@ paths:
         "200":
           description: 穴位列表
 
+  /api/disclaimer.json:
+    get:
+      operationId: getDisclaimer
+      summary: 获取免责声明 (所有诊断结果共用)
+      responses:
+        "200":
+          description: 免责声明
+
   /api/diagnose/{symptom}.json:
     get:
       operationId: diagnoseSymptom
@@ -296,14 +454,38 @@ paths:
           description: 图片URL列表
 """
 
-    with open(os.path.join(DOCS_DIR, "openapi.yaml"), 'w', encoding='utf-8') as f:
-        f.write(openapi_spec)
+def generate_plugin_files():
+    """Generate ChatGPT plugin manifest and OpenAPI spec"""
+    manifest_path = os.path.join(DOCS_DIR, ".well-known", "ai-plugin.json")
+    spec_path = os.path.join(DOCS_DIR, "openapi.yaml")
+    if not (needs_update([GENERATOR_PATH], manifest_path) or needs_update([GENERATOR_PATH], spec_path)):
+        print("✓ Plugin files are up to date")
+        return
+
+    # ai-plugin.json - needs to be updated by user with their domain
+    plugin_manifest = {
+        "schema_version": "v1",
+        "name_for_human": "穴位诊断助手",
+        "name_for_model": "acupressure_diagnosis",
+        "description_for_human": "输入症状，获取穴位按摩建议和位置图片。",
+        "description_for_model": "This plugin helps users find acupressure points based on symptoms. When a user describes pain or discomfort, use this plugin to get recommended acupoints with location images. Endpoints: /api/symptoms.json for symptom list, /api/diagnose/{symptom}.json for diagnosis, /api/disclaimer.json for the disclaimer that applies to every diagnosis, /api/images/{code}.json for acupoint images.",
+        "auth": {"type": "none"},
+        "api": {
+            "type": "openapi",
+            "url": "https://YOUR_USERNAME.github.io/YOUR_REPO/openapi.yaml"
+        },
+        "logo_url": "https://YOUR_USERNAME.github.io/YOUR_REPO/logo.png",
+        "contact_email": "your@email.com",
+        "legal_info_url": "https://YOUR_USERNAME.github.io/YOUR_REPO/"
+    }
+
+    write_json(plugin_manifest, manifest_path)
+
+    write_bytes(spec_path, OPENAPI_SPEC.encode('utf-8'))
 
     print("✓ Generated plugin files (ai-plugin.json, openapi.yaml)")
 
-def generate_index_html():
-    """Generate a simple index.html for the static site"""
-    html = """<!DOCTYPE html>
+INDEX_HTML = """<!DOCTYPE html>
 <html lang="zh">
 <head>
     <meta charset="UTF-8">
@@ -402,7 +584,7 @@ def generate_index_html():
 
         <div class="result" id="result"></div>
 
-        <div class="disclaimer">
+        <div class="disclaimer" id="disclaimer">
             ⚠️ 本工具仅供健康参考，不能替代专业医疗诊断。如有严重症状请及时就医。
         </div>
     </div>
@@ -410,6 +592,16 @@ def generate_index_html():
     <script>
         const BASE = window.location.origin + window.location.pathname.replace(/\\/[^\\/]*$/, '');
 
+        // Shared disclaimer, fetched once instead of shipped in every diagnose file
+        fetch(`${BASE}/api/disclaimer.json`)
+            .then(res => res.json())
+            .then(data => {
+                const p = document.createElement('p');
+                p.textContent = data.disclaimer;
+                document.getElementById('disclaimer').appendChild(p);
+            })
+            .catch(() => {});
+
         async function diagnose(symptom) {
             const resultDiv = document.getElementById('result');
             resultDiv.innerHTML = '<p>加载中...</p>';
@@ -453,11 +645,33 @@ def generate_index_html():
 </html>
 """
 
-    with open(os.path.join(DOCS_DIR, "index.html"), 'w', encoding='utf-8') as f:
-        f.write(html)
+def generate_index_html():
+    """Generate a simple index.html for the static site"""
+    filepath = os.path.join(DOCS_DIR, "index.html")
+    if not needs_update([GENERATOR_PATH], filepath):
+        print("✓ index.html is up to date")
+        return
+
+    write_bytes(filepath, INDEX_HTML.encode('utf-8'))
 
     print("✓ Generated index.html")
 
+def generate_bundle():
+    """Pack docs/ into one compressed tar so a deploy uploads a single file"""
+    if zstandard is not None:
+        bundle_path = os.path.join(PROJECT_ROOT, "docs.tar.zst")
+        with open(bundle_path, 'wb') as raw:
+            with zstandard.ZstdCompressor(level=19).stream_writer(raw) as out:
+                with tarfile.open(fileobj=out, mode='w|') as tar:
+                    tar.add(DOCS_DIR, arcname="docs")
+    else:
+        bundle_path = os.path.join(PROJECT_ROOT, "docs.tar.xz")
+        with tarfile.open(bundle_path, 'w:xz') as tar:
+            tar.add(DOCS_DIR, arcname="docs")
+
+    size_kb = os.path.getsize(bundle_path) // 1024
+    print(f"✓ Bundled docs/ into {os.path.basename(bundle_path)} ({size_kb} KB)")
+
 def main():
     print("=" * 50)
     print("生成静态网站文件...")
@@ -468,10 +682,14 @@ def main():
     generate_acupoints()
     generate_acupoint_details()
     generate_diagnose_files()
+    generate_disclaimer()
     copy_images()
     generate_chat_mapping()
     generate_plugin_files()
     generate_index_html()
+    write_bytes(BUILD_OPTIONS_PATH, BUILD_OPTIONS.encode('utf-8'))
+    if BUILD_BUNDLE:
+        generate_bundle()
 
     print("=" * 50)
     print("✅ 完成！静态文件已生成到 docs/ 目录")
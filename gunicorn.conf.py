@@ -0,0 +1,18 @@
+"""
+Gunicorn config for the dynamic API
+Run: gunicorn -c gunicorn.conf.py
+"""
+
+import multiprocessing
+import os
+
+# api.py imports its sibling modules by name, so load it from src/
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+wsgi_app = "api:app"
+bind = "0.0.0.0:8080"
+
+# gevent workers keep serving /images and /search while /chat waits on the LLM
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_class = "gevent"
+worker_connections = 100
+timeout = 60  # LLM calls time out after 30s each, and /chat may try two providers
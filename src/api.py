@@ -4,19 +4,31 @@ Run: python api.py
 API will be available at http://localhost:8080
 """
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, request, send_from_directory
 from flask_cors import CORS
+import functools
+import hashlib
 import json
 import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
 import requests
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
 # LLM API Configuration (set your API key in environment variable)
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
 
 # Import from our modules
 from acupoint_locator import ACUPOINT_DATA, find_acupoint, generate_image_urls
-from symptom_diagnosis import diagnose, load_symptom_database
+from symptom_diagnosis import SYMPTOM_DB_PATH, diagnose, load_symptom_database
 
 # Paths
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -56,10 +68,55 @@ CODE_TO_CHINESE = {
     "GV4": "命门穴",
 }
 
-app = Flask(__name__)
+
+def symptom_db_version():
+    """st_mtime_ns of the symptom database, the key for everything derived from it"""
+    # diagnose() reloads the file when this changes, so the routes below follow suit
+    return os.stat(SYMPTOM_DB_PATH).st_mtime_ns
+
+
+@functools.lru_cache(maxsize=1)
+def _symptom_names_lower(db_version):
+    """(symptom, symptom.lower()) pairs for the substring searches"""
+    return tuple((s['symptom'], s['symptom'].lower()) for s in load_symptom_database()['symptoms'])
+
+
+# (lowercased "code chinese_name english_name pinyin", result summary) per acupoint, for /search
+_ACUPOINT_SEARCH_INDEX = [
+    (
+        f"{code} {data.get('chinese_name', '')} {data.get('english_name', '')} {data.get('pinyin', '')}".lower(),
+        {
+            "code": data.get("code", code),
+            "chinese_name": data.get("chinese_name", ""),
+            "english_name": data.get("english_name", "")
+        }
+    )
+    for code, data in ACUPOINT_DATA.items()
+]
+
+app = Flask(__name__, static_folder=None)  # files are served by the routes below
 CORS(app)  # Enable CORS for frontend access
 
 
+def dumps_json(obj):
+    """Serialize obj to UTF-8 JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads_json(data):
+    """Parse JSON bytes (orjson when installed); raises ValueError on bad input"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def jsonify(obj):
+    """JSON response with raw UTF-8 Chinese text instead of \\uXXXX escapes"""
+    return app.response_class(dumps_json(obj), mimetype='application/json')
+
+
 @app.route('/')
 def index():
     """API info"""
@@ -76,15 +133,32 @@ def index():
     })
 
 
+def with_etag(payload):
+    """(payload, ETag) for a serialized JSON body; hashed once, where the body is cached"""
+    return payload, hashlib.sha1(payload).hexdigest()
+
+
+def conditional_json(payload, etag):
+    """JSON response with a precomputed ETag; answers 304 if the client's copy is current"""
+    response = app.response_class(payload, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
 @app.route('/symptoms')
 def list_symptoms():
     """List all available symptoms"""
-    db = load_symptom_database()
-    symptoms = [s['symptom'] for s in db['symptoms']]
-    return jsonify({
+    return conditional_json(*_symptoms_payload(symptom_db_version()))
+
+
+@functools.lru_cache(maxsize=1)
+def _symptoms_payload(db_version):
+    """Serialized /symptoms body and its ETag for one version of the database"""
+    symptoms = [name for name, _ in _symptom_names_lower(db_version)]
+    return with_etag(dumps_json({
         "count": len(symptoms),
         "symptoms": symptoms
-    })
+    }))
 
 
 @app.route('/diagnose/<symptom>')
@@ -114,6 +188,12 @@ def get_acupoint(code):
 @app.route('/acupoints')
 def list_acupoints():
     """List all acupoints in database"""
+    return conditional_json(*_acupoints_payload())
+
+
+@functools.lru_cache(maxsize=None)
+def _acupoints_payload():
+    """Serialized /acupoints body and its ETag"""
     acupoints = []
     for code, data in ACUPOINT_DATA.items():
         acupoints.append({
@@ -122,10 +202,10 @@ def list_acupoints():
             "english_name": data.get("english_name", ""),
             "meridian": data.get("meridian", "")
         })
-    return jsonify({
+    return with_etag(dumps_json({
         "count": len(acupoints),
         "acupoints": acupoints
-    })
+    }))
 
 
 @app.route('/search')
@@ -142,20 +222,12 @@ def search():
     }
 
     # Search symptoms
-    db = load_symptom_database()
-    for s in db['symptoms']:
-        if query in s['symptom'].lower():
-            results['symptoms'].append(s['symptom'])
+    for name, name_lower in _symptom_names_lower(symptom_db_version()):
+        if query in name_lower:
+            results['symptoms'].append(name)
 
     # Search acupoints
-    for code, data in ACUPOINT_DATA.items():
-        searchable = f"{code} {data.get('chinese_name', '')} {data.get('english_name', '')} {data.get('pinyin', '')}".lower()
-        if query in searchable:
-            results['acupoints'].append({
-                "code": data.get("code", code),
-                "chinese_name": data.get("chinese_name", ""),
-                "english_name": data.get("english_name", "")
-            })
+    results['acupoints'] = [summary for searchable, summary in _ACUPOINT_SEARCH_INDEX if query in searchable]
 
     return jsonify(results)
 
@@ -188,6 +260,62 @@ LLM_SYSTEM_PROMPT = """你是一位专业的中医针灸穴位顾问。用户会
 【注意事项】如果症状严重需要就医请提醒"""
 
 
+# Exact-match LLM response cache, keyed by the normalized user message
+LLM_CACHE_PATH = os.path.join(PROJECT_ROOT, "DignoseSource", "llm_cache.sqlite")
+LLM_CACHE_TTL = 24 * 60 * 60  # seconds; symptom questions repeat, answers don't go stale quickly
+_llm_cache_lock = threading.Lock()
+
+
+def normalize_message(message):
+    """Normalize a chat message for cache lookup (NFKC, lowercase, collapsed whitespace)"""
+    return " ".join(unicodedata.normalize("NFKC", message).lower().split())
+
+
+@functools.lru_cache(maxsize=1)
+def _llm_cache_db():
+    """Open (and create if needed) the LLM response cache database"""
+    db = sqlite3.connect(LLM_CACHE_PATH, check_same_thread=False)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS llm_cache ("
+        "message TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+    )
+    return db
+
+
+def cached_llm_response(func):
+    """Serve repeated messages from the LLM cache; only successful responses are stored"""
+    @functools.wraps(func)
+    def wrapper(user_message):
+        # Without an API key there is nothing to look up or store
+        if not (OPENAI_API_KEY or ANTHROPIC_API_KEY):
+            return None
+        key = normalize_message(user_message)
+        try:
+            with _llm_cache_lock:
+                row = _llm_cache_db().execute(
+                    "SELECT response FROM llm_cache WHERE message = ? AND created > ?",
+                    (key, time.time() - LLM_CACHE_TTL)
+                ).fetchone()
+            if row:
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"LLM cache error: {e}")
+
+        response = func(user_message)
+        if response:
+            try:
+                with _llm_cache_lock, _llm_cache_db() as db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO llm_cache (message, response, created) VALUES (?, ?, ?)",
+                        (key, response, time.time())
+                    )
+            except sqlite3.Error as e:
+                print(f"LLM cache error: {e}")
+        return response
+    return wrapper
+
+
+@cached_llm_response
 def call_llm_api(user_message):
     """Call LLM API for complex symptom analysis"""
 
@@ -229,7 +357,10 @@ def call_llm_api(user_message):
                 json={
                     "model": "claude-3-haiku-20240307",
                     "max_tokens": 500,
-                    "system": LLM_SYSTEM_PROMPT,
+                    # The system prompt never changes, so mark it as a cacheable prefix
+                    "system": [
+                        {"type": "text", "text": LLM_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+                    ],
                     "messages": [
                         {"role": "user", "content": user_message}
                     ]
@@ -237,7 +368,13 @@ def call_llm_api(user_message):
                 timeout=30
             )
             if resp.status_code == 200:
-                return resp.json()["content"][0]["text"]
+                body = resp.json()
+                # Prompt cache hits are only of interest while developing (python api.py)
+                if app.debug:
+                    cache_read = body.get("usage", {}).get("cache_read_input_tokens", 0)
+                    if cache_read:
+                        print(f"Anthropic prompt cache hit: {cache_read} tokens")
+                return body["content"][0]["text"]
         except Exception as e:
             print(f"Anthropic API error: {e}")
 
@@ -258,10 +395,51 @@ SYMPTOM_KEYWORDS = {
 }
 
 
+def _build_keyword_matcher():
+    """Compile SYMPTOM_KEYWORDS into one scanning regex plus a keyword -> symptom keys map"""
+    keyword_keys = {}
+    for symptom_key, keywords in SYMPTOM_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_keys.setdefault(keyword, set()).add(symptom_key)
+
+    # The scan reports only the longest keyword starting at each position,
+    # so a keyword also carries the keys of the shorter keywords it starts with
+    closed = {
+        keyword: frozenset().union(*(keys for other, keys in keyword_keys.items() if keyword.startswith(other)))
+        for keyword in keyword_keys
+    }
+    alternation = "|".join(re.escape(k) for k in sorted(keyword_keys, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))"), closed
+
+
+# Every keyword occurrence in a message, found in a single pass
+_KEYWORD_RE, _KEYWORD_SYMPTOM_KEYS = _build_keyword_matcher()
+
+
+@functools.lru_cache(maxsize=1)
+def _symptom_key_names(db_version):
+    """symptom_key -> database symptom names containing it, in database order"""
+    names_lower = _symptom_names_lower(db_version)
+    return {
+        symptom_key: [name for name, name_lower in names_lower if symptom_key in name_lower]
+        for symptom_key in SYMPTOM_KEYWORDS
+    }
+
+
+# Acupoint codes mentioned in an LLM response (e.g. "LI4", "gb20")
+ACUPOINT_CODE_RE = re.compile(
+    r'\b(GB\d+|BL\d+|LI\d+|SP\d+|ST\d+|PC\d+|HT\d+|LR\d+|KI\d+|CV\d+|GV\d+|SI\d+|SJ\d+|EX-HN\d+)\b',
+    re.IGNORECASE
+)
+
+
 @app.route('/chat', methods=['POST'])
 def chat_diagnose():
     """Natural language symptom diagnosis - chat style"""
-    data = request.get_json() or {}
+    try:
+        data = loads_json(request.get_data()) or {}
+    except ValueError:
+        data = {}
     user_input = data.get('message', '').lower()
 
     if not user_input:
@@ -269,34 +447,33 @@ def chat_diagnose():
 
     # Find matching symptoms based on keywords
     matched_symptoms = []
-    db = load_symptom_database()
+    db_version = symptom_db_version()
 
-    for symptom_key, keywords in SYMPTOM_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in user_input:
-                # Find the full symptom name in database
-                for s in db['symptoms']:
-                    if symptom_key in s['symptom'].lower():
-                        if s['symptom'] not in matched_symptoms:
-                            matched_symptoms.append(s['symptom'])
-                break
+    hit_keys = set()
+    for match in _KEYWORD_RE.finditer(user_input):
+        hit_keys |= _KEYWORD_SYMPTOM_KEYS[match.group(1)]
+
+    # Keep the SYMPTOM_KEYWORDS order for the matched symptoms
+    for symptom_key, names in _symptom_key_names(db_version).items():
+        if symptom_key in hit_keys:
+            for name in names:
+                if name not in matched_symptoms:
+                    matched_symptoms.append(name)
 
     # If no keyword match, try direct search in symptom names
     if not matched_symptoms:
-        for s in db['symptoms']:
-            symptom_lower = s['symptom'].lower()
+        for name, name_lower in _symptom_names_lower(db_version):
             for word in user_input.split():
-                if len(word) > 2 and word in symptom_lower:
-                    if s['symptom'] not in matched_symptoms:
-                        matched_symptoms.append(s['symptom'])
+                if len(word) > 2 and word in name_lower:
+                    if name not in matched_symptoms:
+                        matched_symptoms.append(name)
 
     if not matched_symptoms:
         # Try LLM for complex symptoms
         llm_response = call_llm_api(user_input)
         if llm_response:
             # Extract acupoint codes from LLM response
-            import re
-            acupoint_codes = re.findall(r'\b(GB\d+|BL\d+|LI\d+|SP\d+|ST\d+|PC\d+|HT\d+|LR\d+|KI\d+|CV\d+|GV\d+|SI\d+|SJ\d+|EX-HN\d+)\b', llm_response, re.IGNORECASE)
+            acupoint_codes = ACUPOINT_CODE_RE.findall(llm_response)
             acupoint_codes = list(set([c.upper() for c in acupoint_codes]))
 
             # Get acupoint details for recommended points
@@ -322,7 +499,7 @@ def chat_diagnose():
         return jsonify({
             "success": False,
             "message": "抱歉，我没有找到匹配的症状。请试试：头痛、失眠、焦虑、腰痛、颈椎等关键词。\n\n如需更智能的分析，请设置 OPENAI_API_KEY 或 ANTHROPIC_API_KEY 环境变量。",
-            "available_symptoms": [s['symptom'] for s in db['symptoms']]
+            "available_symptoms": [name for name, _ in _symptom_names_lower(db_version)]
         })
 
     # Get diagnosis for first matched symptom
@@ -337,41 +514,86 @@ def chat_diagnose():
     })
 
 
+IMAGE_EXTS = ('.jpg', '.png', '.gif', '.webp')
+# Image files never change once scraped; let browsers cache them for a day
+IMAGE_MAX_AGE = 86400
+
+# path -> (st_mtime_ns, image filenames); a directory is re-listed only when it changes
+_LISTDIR_CACHE = {}
+# (st_mtime_ns, {chinese_name: filenames}) for CHINESE_IMAGE_DIR
+_CHINESE_IMAGE_INDEX = (None, {})
+
+
+def _image_files(path):
+    """Image filenames in a directory, cached until the directory's mtime changes"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, []
+    cached = _LISTDIR_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, [f for f in os.listdir(path) if f.endswith(IMAGE_EXTS)])
+        _LISTDIR_CACHE[path] = cached
+    return cached
+
+
+def _chinese_images(chinese_name):
+    """Files in CHINESE_IMAGE_DIR whose name starts with chinese_name"""
+    global _CHINESE_IMAGE_INDEX
+    mtime, files = _image_files(CHINESE_IMAGE_DIR)
+    if _CHINESE_IMAGE_INDEX[0] != mtime:
+        # Group the listing by every known name at once, so lookups are dict hits
+        index = {
+            name: [f for f in files if f.startswith(name)]
+            for name in set(CODE_TO_CHINESE.values())
+        }
+        _CHINESE_IMAGE_INDEX = (mtime, index)
+    return _CHINESE_IMAGE_INDEX[1].get(chinese_name, [])
+
+
 @app.route('/images/<code>')
 def get_acupoint_images(code):
     """Get list of images for an acupoint from all sources"""
     code_upper = code.upper()
+    # The directory mtimes key the cached body, so it is rebuilt only when a listing changes
+    point_mtime, _ = _image_files(os.path.join(IMAGE_DIR, code_upper))
+    chinese_mtime = None
+    if code_upper in CODE_TO_CHINESE:
+        chinese_mtime, _ = _image_files(CHINESE_IMAGE_DIR)
+    return conditional_json(*_images_payload(code_upper, point_mtime, chinese_mtime))
+
+
+@functools.lru_cache(maxsize=256)
+def _images_payload(code_upper, point_mtime, chinese_mtime):
+    """Serialized /images/<code> body and its ETag for the given directory versions"""
     images = []
 
     # Source 1: Scraped images from IMAGE_DIR (e.g., /DignoseSource/acupoint_images/GB30/)
-    point_dir = os.path.join(IMAGE_DIR, code_upper)
-    if os.path.exists(point_dir):
-        for f in os.listdir(point_dir):
-            if f.endswith(('.jpg', '.png', '.gif', '.webp')):
-                images.append(f"/images/{code_upper}/{f}")
+    _, files = _image_files(os.path.join(IMAGE_DIR, code_upper))
+    for f in files:
+        images.append(f"/images/{code_upper}/{f}")
 
     # Source 2: Chinese acuPointData images (named by Chinese name)
+    # Match files like "合谷穴1.jpg", "三阴交1.jpg"
     chinese_name = CODE_TO_CHINESE.get(code_upper, "")
-    if chinese_name and os.path.exists(CHINESE_IMAGE_DIR):
-        for f in os.listdir(CHINESE_IMAGE_DIR):
-            # Match files like "合谷穴1.jpg", "三阴交1.jpg"
-            if f.startswith(chinese_name) and f.endswith(('.jpg', '.png', '.gif', '.webp')):
-                images.append(f"/images/chinese/{f}")
+    if chinese_name:
+        for f in _chinese_images(chinese_name):
+            images.append(f"/images/chinese/{f}")
 
-    return jsonify({"code": code_upper, "images": images, "count": len(images)})
+    return with_etag(dumps_json({"code": code_upper, "images": images, "count": len(images)}))
 
 
 @app.route('/images/<code>/<filename>')
 def serve_image(code, filename):
     """Serve acupoint image file from scraped folder"""
     point_dir = os.path.join(IMAGE_DIR, code.upper())
-    return send_from_directory(point_dir, filename)
+    return send_from_directory(point_dir, filename, conditional=True, max_age=IMAGE_MAX_AGE)
 
 
 @app.route('/images/chinese/<filename>')
 def serve_chinese_image(filename):
     """Serve acupoint image file from Chinese acuPointData folder"""
-    return send_from_directory(CHINESE_IMAGE_DIR, filename)
+    return send_from_directory(CHINESE_IMAGE_DIR, filename, conditional=True, max_age=IMAGE_MAX_AGE)
 
 
 # ============ ChatGPT Plugin Support ============
@@ -396,7 +618,7 @@ def serve_openapi_spec():
 def serve_logo():
     """Serve plugin logo"""
     # Return a simple placeholder or actual logo
-    return send_from_directory(os.path.join(PROJECT_ROOT, 'web'), 'logo.png')
+    return send_from_directory(os.path.join(PROJECT_ROOT, 'web'), 'logo.png', conditional=True, max_age=IMAGE_MAX_AGE)
 
 
 if __name__ == '__main__':
@@ -7,10 +7,20 @@ import os
 import re
 import json
 import time
+import hashlib
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # fall back to BeautifulSoup
+    HTMLParser = None
+
 # Import acupoint data
 from acupoint_locator import ACUPOINT_DATA
 
@@ -22,21 +32,156 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.5,zh-CN;q=0.3"
 }
+# Meridian name -> acupuncture.com URL segment
+MERIDIAN_MAP = {
+    "Gallbladder": "gallbladder", "Bladder": "bladder", "Kidney": "kidney",
+    "Large Intestine": "largeintestine", "Liver": "liver", "Pericardium": "pericardium",
+    "Heart": "heart", "Spleen": "spleen", "Stomach": "stomach",
+    "Small Intestine": "smallintestine", "San Jiao": "sanjiao"
+}
+# Points that already have this many images are skipped on reruns
+MIN_IMAGES_PER_POINT = 5
+# Per-URL download results (sha256(url) -> status, bytes, ts); failures are retried after a week
+URL_CACHE_PATH = os.path.join(IMAGE_DIR, "_cache.json")
+URL_FAIL_TTL = 7 * 24 * 60 * 60
+URL_CACHE = {}
+_url_cache_lock = threading.Lock()
+# Acupoints scraped at the same time; each worker still pauses between its points
+MAX_WORKERS = 6
+# Downloaded images must be larger than MIN (smaller ones are icons/placeholders) and at most MAX bytes
+MIN_IMAGE_BYTES = 2000
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 32 * 1024
+
+
+def make_session():
+    """Shared HTTP session: keep-alive connection pools plus retries on transient errors"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = make_session()
 
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
 
+def load_url_cache():
+    """Load the per-URL download cache into URL_CACHE"""
+    try:
+        with open(URL_CACHE_PATH, 'r', encoding='utf-8') as f:
+            URL_CACHE.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+
+def save_url_cache():
+    """Write URL_CACHE to disk (atomically, so an interrupted run can't corrupt it)"""
+    # The write and replace stay under the lock too, so a worker can't put back
+    # an older snapshot after another worker saved a newer one
+    with _url_cache_lock:
+        tmp_path = f"{URL_CACHE_PATH}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(URL_CACHE, f)
+        os.replace(tmp_path, URL_CACHE_PATH)
+
+
+def url_cache_key(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def recently_failed(url):
+    """True if downloading url failed within URL_FAIL_TTL"""
+    entry = URL_CACHE.get(url_cache_key(url))
+    return bool(entry) and entry['status'] == 'fail' and time.time() - entry['ts'] < URL_FAIL_TTL
+
+
+def existing_images(code):
+    """Image files already downloaded for an acupoint"""
+    point_dir = os.path.join(IMAGE_DIR, code)
+    if not os.path.isdir(point_dir):
+        return []
+    return [f for f in os.listdir(point_dir) if f.endswith(('.jpg', '.png', '.gif', '.webp'))]
+
+
+def select_attrs(html, selector):
+    """Attribute dicts of the elements matching a CSS selector (selectolax if installed)"""
+    if HTMLParser is not None:
+        return [node.attributes for node in HTMLParser(html).css(selector)]
+    return [tag.attrs for tag in BeautifulSoup(html, 'lxml').select(selector)]
+
+
+# Leading bytes of JPEG, PNG, GIF and RIFF (WebP) files
+IMAGE_MAGIC = (b'\xff\xd8', b'\x89PNG', b'GIF8', b'RIFF')
+
+
+def probe_image(url):
+    """Cheap pre-check before downloading: HEAD, or a 2 KB ranged GET if HEAD is refused"""
+    try:
+        resp = SESSION.head(url, timeout=5, allow_redirects=True)
+        if resp.status_code not in (405, 501):
+            if resp.status_code != 200:
+                return False
+            content_type = resp.headers.get('content-type', '')
+            if 'image' not in content_type and not url.endswith(('.jpg', '.png', '.gif', '.webp')):
+                return False
+            length = resp.headers.get('content-length')
+            # No length (e.g. chunked) is left for the download to measure
+            return length is None or not length.isdigit() or MIN_IMAGE_BYTES < int(length) <= MAX_IMAGE_BYTES
+
+        # HEAD not supported: sniff the first bytes for an image signature
+        with SESSION.get(url, headers={"Range": "bytes=0-2047"}, timeout=5, stream=True) as resp:
+            if resp.status_code not in (200, 206):
+                return False
+            head = next(resp.iter_content(chunk_size=2048), b'')
+            return head.startswith(IMAGE_MAGIC) and (not head.startswith(b'RIFF') or head[8:12] == b'WEBP')
+    except Exception:
+        return False
+
+
 def download_image(url, save_path):
-    """Download image from URL"""
+    """Download image from URL, streaming it to disk in chunks.
+
+    The body goes to a .part file that replaces save_path only once the
+    download succeeded, so a failed attempt never touches an existing image.
+    """
+    if not probe_image(url):
+        return False
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=15, allow_redirects=True)
-        content_type = resp.headers.get('content-type', '')
-        if resp.status_code == 200 and len(resp.content) > 2000:
-            if 'image' in content_type or url.endswith(('.jpg', '.png', '.gif', '.webp')):
-                with open(save_path, 'wb') as f:
-                    f.write(resp.content)
-                return True
+        with SESSION.get(url, timeout=15, allow_redirects=True, stream=True) as resp:
+            content_type = resp.headers.get('content-type', '')
+            # Check status and type before reading any of the body
+            if resp.status_code != 200:
+                return False
+            if 'image' not in content_type and not url.endswith(('.jpg', '.png', '.gif', '.webp')):
+                return False
+
+            part_path = save_path + '.part'
+            total = 0
+            saved = False
+            try:
+                with open(part_path, 'wb') as f:
+                    for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        total += len(chunk)
+                        if total > MAX_IMAGE_BYTES:
+                            break
+                        f.write(chunk)
+                saved = MIN_IMAGE_BYTES < total <= MAX_IMAGE_BYTES
+                if saved:
+                    os.replace(part_path, save_path)
+            finally:
+                # Drop partial, oversized and too-small (placeholder) files
+                if not saved and os.path.exists(part_path):
+                    os.remove(part_path)
+            return saved
     except Exception as e:
         pass
     return False
@@ -45,9 +190,9 @@ def download_image(url, save_path):
 def search_google_images(query, num_images=10):
     """Search Google Images"""
     search_url = f"https://www.google.com/search?q={quote(query)}&tbm=isch&safe=active"
-    images = []
+    images = {}  # insertion-ordered set of URLs
     try:
-        resp = requests.get(search_url, headers=HEADERS, timeout=15)
+        resp = SESSION.get(search_url, timeout=15)
         # Extract image URLs from various patterns
         patterns = [
             r'"(https?://[^"]+\.(?:jpg|jpeg|png|gif|webp))"',
@@ -57,96 +202,97 @@ def search_google_images(query, num_images=10):
             matches = re.findall(pattern, resp.text, re.IGNORECASE)
             for url in matches:
                 if 'google' not in url.lower() and 'gstatic' not in url.lower():
-                    if url not in images:
-                        images.append(url)
+                    images[url] = None
 
         # Also try data-src patterns
-        soup = BeautifulSoup(resp.text, 'lxml')
-        for img in soup.find_all('img'):
+        for attrs in select_attrs(resp.text, 'img'):
             for attr in ['data-src', 'data-iurl', 'src']:
-                src = img.get(attr, '')
+                src = attrs.get(attr) or ''
                 if src and src.startswith('http') and 'google' not in src:
-                    if src not in images:
-                        images.append(src)
+                    images[src] = None
     except Exception as e:
         print(f"    Google error: {e}")
 
-    return images[:num_images]
+    return list(images)[:num_images]
 
 
 def search_bing_images(query, num_images=8):
     """Search Bing Images"""
-    search_url = f"https://www.bing.com/images/search?q={quote(query)}&form=HDRSC2"
-    images = []
+    # The async endpoint returns just the result tiles, not the whole search page
+    search_url = "https://www.bing.com/images/async"
+    params = {"q": query, "first": 0, "count": max(num_images, 35), "mmasync": 1}
+    images = {}  # insertion-ordered set of URLs
     try:
-        resp = requests.get(search_url, headers=HEADERS, timeout=15)
-        # Bing uses murl parameter for full image URLs
-        pattern = r'murl&quot;:&quot;(https?://[^&]+)&quot;'
-        matches = re.findall(pattern, resp.text)
-        for url in matches:
-            url = url.replace('\\u002f', '/')
-            if url not in images:
-                images.append(url)
+        resp = SESSION.get(search_url, params=params, timeout=15)
+        # Each tile's "m" attribute is JSON; murl is the full image URL
+        for attrs in select_attrs(resp.text, 'a.iusc'):
+            try:
+                url = json.loads(attrs.get('m') or '')['murl']
+            except (ValueError, KeyError, TypeError):
+                continue
+            if url.startswith('http'):
+                images[url] = None
     except Exception as e:
         print(f"    Bing error: {e}")
 
-    return images[:num_images]
+    return list(images)[:num_images]
 
 
 def search_baidu_images(query, num_images=8):
     """Search Baidu Images (Chinese)"""
-    search_url = f"https://image.baidu.com/search/index?tn=baiduimage&word={quote(query)}"
-    images = []
+    # acjson is the JSON endpoint behind the Baidu image result page
+    search_url = "https://image.baidu.com/search/acjson"
+    params = {
+        "tn": "resultjson_com", "ipn": "rj", "word": query, "queryWord": query,
+        "ie": "utf-8", "oe": "utf-8", "pn": 0, "rn": 30
+    }
+    images = {}  # insertion-ordered set of URLs
     try:
-        resp = requests.get(search_url, headers={**HEADERS, "Accept-Language": "zh-CN,zh;q=0.9"}, timeout=15)
-        # Baidu uses objURL or thumbURL
-        patterns = [
-            r'"objURL":"(https?://[^"]+)"',
-            r'"thumbURL":"(https?://[^"]+)"',
-            r'"middleURL":"(https?://[^"]+)"',
-        ]
-        for pattern in patterns:
-            matches = re.findall(pattern, resp.text)
-            for url in matches:
-                if url not in images:
-                    images.append(url)
+        resp = SESSION.get(search_url, params=params, headers={"Accept-Language": "zh-CN,zh;q=0.9"}, timeout=15)
+        # Baidu sometimes emits raw control characters in strings, so parse leniently
+        data = json.loads(resp.text, strict=False).get('data', [])
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            # objURL is often obfuscated; fall back to the thumbnail URLs
+            for key in ('objURL', 'middleURL', 'thumbURL'):
+                url = item.get(key) or ''
+                if url.startswith('http'):
+                    images[url] = None
+                    break
     except Exception as e:
         print(f"    Baidu error: {e}")
 
-    return images[:num_images]
+    return list(images)[:num_images]
 
 
 def scrape_tcm_sites(code, english_name, chinese_name, meridian):
     """Scrape from TCM educational sites"""
     images = []
+    code_lower = code.lower()
 
     # YinYangHouse
     try:
-        url = f"https://yinyanghouse.com/theory/acupuncturepoints/{code.lower()}/"
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(resp.text, 'lxml')
-        for img in soup.find_all('img'):
-            src = img.get('src', '') or img.get('data-src', '')
-            if src and ('point' in src.lower() or 'meridian' in src.lower() or code.lower() in src.lower()):
+        url = f"https://yinyanghouse.com/theory/acupuncturepoints/{code_lower}/"
+        resp = SESSION.get(url, timeout=10)
+        # One scan per src instead of three substring checks
+        wanted = re.compile(rf"point|meridian|{re.escape(code_lower)}")
+        for attrs in select_attrs(resp.text, 'img'):
+            src = attrs.get('src') or attrs.get('data-src') or ''
+            if src and wanted.search(src.lower()):
                 images.append(urljoin(url, src))
     except:
         pass
 
     # Acupuncture.com
-    meridian_map = {
-        "Gallbladder": "gallbladder", "Bladder": "bladder", "Kidney": "kidney",
-        "Large Intestine": "largeintestine", "Liver": "liver", "Pericardium": "pericardium",
-        "Heart": "heart", "Spleen": "spleen", "Stomach": "stomach",
-        "Small Intestine": "smallintestine", "San Jiao": "sanjiao"
-    }
     try:
-        m = meridian_map.get(meridian, meridian.lower().replace(" ", ""))
-        url = f"https://www.acupuncture.com/education/points/{m}/{code.lower()}.htm"
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(resp.text, 'lxml')
-        for img in soup.find_all('img'):
-            src = img.get('src', '')
-            if src and (code.lower() in src.lower() or '.gif' in src.lower() or '.jpg' in src.lower()):
+        m = MERIDIAN_MAP.get(meridian, meridian.lower().replace(" ", ""))
+        url = f"https://www.acupuncture.com/education/points/{m}/{code_lower}.htm"
+        resp = SESSION.get(url, timeout=10)
+        wanted = re.compile(rf"{re.escape(code_lower)}|\.gif|\.jpg")
+        for attrs in select_attrs(resp.text, 'img'):
+            src = attrs.get('src') or ''
+            if src and wanted.search(src.lower()):
                 images.append(urljoin(url, src))
     except:
         pass
@@ -154,6 +300,15 @@ def scrape_tcm_sites(code, english_name, chinese_name, meridian):
     return images
 
 
+def search_google_queries(queries, num_images):
+    """Run several Google Images searches back to back, pausing between them"""
+    images = []
+    for q in queries:
+        images.extend(search_google_images(q, num_images))
+        time.sleep(0.5)
+    return images
+
+
 def scrape_acupoint_images(code, data):
     """Scrape 5+ images for a single acupoint"""
     print(f"\n📍 {code} - {data.get('chinese_name', '')} ({data.get('english_name', '')})")
@@ -165,46 +320,46 @@ def scrape_acupoint_images(code, data):
     english_name = data.get('english_name', '')
     meridian = data.get('meridian', '')
 
+    # Sources are queried one after another: the main() pool already overlaps
+    # several points, and a per-point pool would multiply the load on each site.
+    # Progress lines carry the code since points are logged concurrently.
     all_images = []
 
     # 1. TCM educational sites
-    print("  [1/4] Scraping TCM sites...")
+    print(f"  [{code} 1/4] Scraping TCM sites...")
     all_images.extend(scrape_tcm_sites(code, english_name, chinese_name, meridian))
 
     # 2. Google Images - multiple queries
-    print("  [2/4] Searching Google Images...")
-    queries = [
+    print(f"  [{code} 2/4] Searching Google Images...")
+    all_images.extend(search_google_queries([
         f"{code} {english_name} acupoint location",
         f"{code} acupuncture point diagram",
         f"{chinese_name}穴 位置图",
-    ]
-    for q in queries:
-        all_images.extend(search_google_images(q, 5))
-        time.sleep(0.5)
+    ], 5))
 
     # 3. Bing Images
-    print("  [3/4] Searching Bing Images...")
+    print(f"  [{code} 3/4] Searching Bing Images...")
     all_images.extend(search_bing_images(f"{code} {english_name} acupoint", 6))
 
     # 4. Baidu Images (Chinese)
-    print("  [4/4] Searching Baidu Images...")
+    print(f"  [{code} 4/4] Searching Baidu Images...")
     all_images.extend(search_baidu_images(f"{chinese_name}穴 位置 取穴", 6))
 
     # Remove duplicates while preserving order
-    seen = set()
-    unique_images = []
-    for url in all_images:
-        if url not in seen and url.startswith('http'):
-            seen.add(url)
-            unique_images.append(url)
+    unique_images = [url for url in dict.fromkeys(all_images) if url.startswith('http')]
 
-    print(f"  Found {len(unique_images)} unique image URLs")
+    print(f"  [{code}] Found {len(unique_images)} unique image URLs")
 
     # Download images (target: at least 5)
     downloaded = []
-    for i, img_url in enumerate(unique_images):
+    # Numbers already used by images from earlier runs are skipped, not overwritten
+    taken = {os.path.splitext(f)[0] for f in existing_images(code)}
+    next_number = 1
+    for img_url in unique_images:
         if len(downloaded) >= 8:  # Max 8 per point
             break
+        if recently_failed(img_url):
+            continue
 
         ext = 'jpg'
         if '.png' in img_url.lower():
@@ -214,15 +369,26 @@ def scrape_acupoint_images(code, data):
         elif '.webp' in img_url.lower():
             ext = 'webp'
 
-        filename = f"{code}_{len(downloaded)+1}.{ext}"
+        while f"{code}_{next_number}" in taken:
+            next_number += 1
+        filename = f"{code}_{next_number}.{ext}"
         save_path = os.path.join(point_dir, filename)
 
-        if download_image(img_url, save_path):
+        ok = download_image(img_url, save_path)
+        with _url_cache_lock:
+            URL_CACHE[url_cache_key(img_url)] = {
+                "status": "ok" if ok else "fail",
+                "bytes": os.path.getsize(save_path) if ok else 0,
+                "ts": time.time()
+            }
+        if ok:
             downloaded.append(filename)
+            taken.add(f"{code}_{next_number}")
             print(f"  ✅ [{len(downloaded)}] {filename}")
 
-        if len(downloaded) < 5 and i >= len(unique_images) - 1:
-            print(f"  ⚠️  Only got {len(downloaded)} images")
+    if len(downloaded) < 5:
+        print(f"  ⚠️  {code}: only got {len(downloaded)} images")
+    save_url_cache()
 
     # Save metadata
     metadata = {
@@ -233,11 +399,25 @@ def scrape_acupoint_images(code, data):
         "image_count": len(downloaded)
     }
     with open(os.path.join(point_dir, "metadata.json"), 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, ensure_ascii=False, indent=2)
+        f.write(json.dumps(metadata, ensure_ascii=False, indent=2))
 
     return len(downloaded)
 
 
+def scrape_acupoint_worker(code, data):
+    """Scrape one acupoint, then pause before the worker takes the next one.
+
+    Returns (image count, whether the point was skipped because it already had enough images).
+    """
+    existing = existing_images(code)
+    if len(existing) >= MIN_IMAGES_PER_POINT:
+        print(f"\n⏭️  {code}: already has {len(existing)} images, skipping")
+        return len(existing), True
+    count = scrape_acupoint_images(code, data)
+    time.sleep(1.5)  # Be nice to servers
+    return count, False
+
+
 def main():
     print("=" * 60)
     print("🖼️  Acupoint Image Scraper v2")
@@ -245,19 +425,30 @@ def main():
     print("=" * 60)
 
     ensure_dir(IMAGE_DIR)
+    load_url_cache()
 
     total_downloaded = 0
-    results = {}
-
-    for code, data in ACUPOINT_DATA.items():
-        try:
-            count = scrape_acupoint_images(code, data)
-            total_downloaded += count
-            results[code] = count
-            time.sleep(1.5)  # Be nice to servers
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            results[code] = 0
+    total_existing = 0
+    results = dict.fromkeys(ACUPOINT_DATA, 0)  # summary keeps the database order
+
+    # Points are independent and network-bound, so scrape several at once
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(scrape_acupoint_worker, code, data): code
+            for code, data in ACUPOINT_DATA.items()
+        }
+        for future in as_completed(futures):
+            code = futures[future]
+            try:
+                count, skipped = future.result()
+                # Images already on disk count for the per-point status, not as downloads
+                if skipped:
+                    total_existing += count
+                else:
+                    total_downloaded += count
+                results[code] = count
+            except Exception as e:
+                print(f"  ❌ {code} Error: {e}")
 
     print("\n" + "=" * 60)
     print("📊 Summary:")
@@ -266,6 +457,8 @@ def main():
         print(f"  {status} {code}: {count} images")
 
     print(f"\n✅ Total: {total_downloaded} images downloaded")
+    if total_existing:
+        print(f"⏭️  {total_existing} existing images kept (points skipped)")
     print(f"📁 Saved to: {IMAGE_DIR}")
     print("=" * 60)
 
@@ -4,200 +4,396 @@ Usage: python symptom_diagnosis.py "low back pain"
        python symptom_diagnosis.py --list  (show all symptoms)
 """
 
+from __future__ import annotations
+
+import functools
 import json
 import sys
 import os
-from typing import List, Optional, Dict
+from urllib.parse import quote_plus
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # fall back to loading the whole database
+    ijson = None
+
+# Acupoint details are resolved per code, only for the points a symptom recommends
+from acupoint_locator import find_acupoints
 
-# Import acupoint data from locator
-from acupoint_locator import ACUPOINT_DATA, generate_image_urls, find_acupoint
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYMPTOM_DB_PATH = os.path.join(PROJECT_ROOT, "DignoseSource", "acupressure_by_symptom.json")
 
-def load_symptom_database() -> Dict:
-    """Load the symptom-to-acupoint mapping database"""
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    db_path = os.path.join(project_root, "DignoseSource", "acupressure_by_symptom.json")
 
-    with open(db_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def load_symptom_database() -> dict:
+    """Load the symptom-to-acupoint mapping database (parsed once per file version)"""
+    return _load_symptom_database(os.stat(SYMPTOM_DB_PATH).st_mtime_ns)
 
 
+@functools.lru_cache(maxsize=1)
+def _load_symptom_database(mtime_ns: int) -> dict:
+    """Parse the database; mtime_ns is only the cache key, so edits to the file invalidate it"""
+    if orjson is not None:
+        with open(SYMPTOM_DB_PATH, 'rb') as f:
+            db = orjson.loads(f.read())
+    else:
+        with open(SYMPTOM_DB_PATH, 'r', encoding='utf-8') as f:
+            db = json.load(f)
+    # Lowercase and index the symptom names now rather than on the first query
+    _symptom_index(db)
+    return db
+
+
+@functools.lru_cache(maxsize=None)
 def normalize_code(code: str) -> str:
-    """Normalize acupoint code for lookup"""
-    # Handle special cases
-    code_upper = code.upper().replace(" ", "_")
-    if code_upper == "AURICULAR_SHENMEN":
-        return "AURICULAR_SHENMEN"
-    return code_upper
+    """Normalize acupoint code for lookup (cached; the database has a fixed set of codes)"""
+    # "Auricular Shenmen" -> "AURICULAR_SHENMEN"
+    return code.upper().replace(" ", "_")
+
 
+def build_symptom_index(symptoms: list[dict]) -> dict[str, int]:
+    """Map every substring of each lowercased symptom name to the first entry containing it"""
+    index = {}
+    for i, entry in enumerate(symptoms):
+        name = entry['symptom'].lower()
+        for start in range(len(name) + 1):
+            for end in range(start, len(name) + 1):
+                index.setdefault(name[start:end], i)
+    return index
 
-def find_symptom(query: str, db: Dict) -> Optional[Dict]:
+
+# (db, index) for the database find_symptom last saw
+_symptom_index_cache = (None, {})
+
+
+def _symptom_index(db: dict) -> dict[str, int]:
+    """Substring index for db, rebuilt only when a different database is passed in"""
+    global _symptom_index_cache
+    cached_db, index = _symptom_index_cache
+    if cached_db is not db:
+        index = build_symptom_index(db['symptoms'])
+        _symptom_index_cache = (db, index)
+    return index
+
+
+def find_symptom(query: str, db: dict) -> dict | None:
     """Find matching symptom entry"""
-    query_lower = query.lower()
+    i = _find_symptom_index(query, db)
+    return db['symptoms'][i] if i is not None else None
 
-    for symptom_entry in db['symptoms']:
-        symptom = symptom_entry['symptom'].lower()
-        # Check if query matches any part of the symptom
-        if query_lower in symptom or any(word in symptom for word in query_lower.split()):
-            return symptom_entry
 
-    return None
+def _find_symptom_index(query: str, db: dict) -> int | None:
+    """Position in db['symptoms'] of the matching symptom entry, or None"""
+    query_lower = query.lower()
 
+    # The first symptom containing the query, or any word of it, wins;
+    # the index answers "first symptom containing X" with one dict probe
+    index = _symptom_index(db)
+    hits = [index[key] for key in (query_lower, *query_lower.split()) if key in index]
+    return min(hits) if hits else None
 
-def diagnose(symptom_query: str) -> Dict:
+
+def diagnose(symptom_query: str) -> dict:
     """
     Main diagnosis function.
     Input: symptom description (e.g., "low back pain", "headache", "nausea")
     Output: Dict with symptom info, recommended acupoints with full location details and images
     """
-    db = load_symptom_database()
+    mtime_ns = os.stat(SYMPTOM_DB_PATH).st_mtime_ns
+    db = _load_symptom_database(mtime_ns)
 
     # Find matching symptom
-    symptom_entry = find_symptom(symptom_query, db)
+    entry_index = _find_symptom_index(symptom_query, db)
 
-    if not symptom_entry:
+    if entry_index is None:
         return {
             "success": False,
             "error": f"No matching symptom found for: {symptom_query}",
-            "available_symptoms": [s['symptom'] for s in db['symptoms']]
+            "available_symptoms": _symptom_names(mtime_ns)
+        }
+
+    # Every query that resolves to the same symptom shares one enriched result;
+    # callers get their own copy so they can't modify the cached one
+    return _copy_diagnosis(_diagnose_entry(mtime_ns, entry_index))
+
+
+@functools.lru_cache(maxsize=1)
+def _symptom_names(mtime_ns: int) -> tuple:
+    """All symptom names, shared (immutable) by every no-match result"""
+    return tuple(s['symptom'] for s in _load_symptom_database(mtime_ns)['symptoms'])
+
+
+def _copy_diagnosis(result: dict) -> dict:
+    """Copy a diagnosis result down to its nested lists and dicts"""
+    return {
+        **result,
+        "sources": list(result['sources']),
+        "acupoints": [point.to_dict() for point in result['acupoints']]
+    }
+
+
+@dataclass(frozen=True)
+class EnrichedPoint:
+    """A recommended acupoint as stored in the diagnosis cache.
+
+    Detail fields are None for points without detailed data and are left
+    out of to_dict(), matching the JSON a diagnosis has always returned.
+    """
+    # Declared by hand (dataclass(slots=True) needs Python 3.10), so fields
+    # can't have class-level defaults; see _NO_DETAILS
+    __slots__ = (
+        'code', 'name', 'chinese_name', 'meridian', 'basic_hint', 'notes',
+        'standard_location', 'standard_location_en', 'simple_method',
+        'simple_method_en', 'anatomical', 'caution', 'image_sources'
+    )
+
+    code: str
+    name: str
+    chinese_name: str | None
+    meridian: str
+    basic_hint: str
+    notes: str
+    # Detailed location from our database
+    standard_location: str | None
+    standard_location_en: str | None
+    simple_method: str | None
+    simple_method_en: str | None
+    anatomical: str | None
+    caution: str | None
+    image_sources: tuple
+
+    def to_dict(self) -> dict:
+        """JSON-ready dict with its own copies of the image source dicts"""
+        point = {}
+        for field in _POINT_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                point[field] = value
+        point['image_sources'] = [dict(src) for src in self.image_sources]
+        return point
+
+
+# EnrichedPoint fields in output order (image_sources is copied separately)
+_POINT_FIELDS = tuple(f.name for f in fields(EnrichedPoint) if f.name != 'image_sources')
+
+# Detail fields of a point without detailed data
+_NO_DETAILS = dict.fromkeys((
+    'chinese_name', 'standard_location', 'standard_location_en',
+    'simple_method', 'simple_method_en', 'anatomical', 'caution'
+))
+
+
+_GOOGLE_IMAGES_URL = "https://www.google.com/search?tbm=isch&q={}".format
+
+
+def fallback_image_sources(code: str, name: str) -> list[dict]:
+    """Image search link for a point without detailed data"""
+    return [
+        {
+            "name": "Google Images",
+            "url": _GOOGLE_IMAGES_URL(quote_plus(f"{code} {name} acupoint location")),
+            "type": "image_search"
         }
+    ]
+
+
+@functools.lru_cache(maxsize=256)
+def _diagnose_entry(mtime_ns: int, entry_index: int) -> dict:
+    """Build the diagnosis for one symptom entry (cached per database version)"""
+    db = _load_symptom_database(mtime_ns)
+    symptom_entry = db['symptoms'][entry_index]
+
+    # Get full acupoint data for all recommended points in one lookup
+    codes = [normalize_code(point['code']) for point in symptom_entry['points']]
+    details = find_acupoints(codes)
 
     # Get detailed info for each recommended acupoint
     enriched_points = []
-    for point in symptom_entry['points']:
-        code = normalize_code(point['code'])
-
-        # Get full acupoint data
-        full_data = find_acupoint(code)
+    for point, code in zip(symptom_entry['points'], codes):
+        full_data = details.get(code)
 
         if full_data:
-            enriched_points.append({
-                "code": point['code'],
-                "name": point['name'],
-                "chinese_name": full_data.get('chinese_name', ''),
-                "meridian": point['meridian'],
-                "basic_hint": point['location_hint'],
-                "notes": point.get('notes', ''),
+            enriched_points.append(EnrichedPoint(
+                code=point['code'],
+                name=point['name'],
+                chinese_name=full_data.get('chinese_name', ''),
+                meridian=point['meridian'],
+                basic_hint=point['location_hint'],
+                notes=point.get('notes', ''),
                 # Detailed location from our database
-                "standard_location": full_data.get('standard_location', ''),
-                "standard_location_en": full_data.get('standard_location_en', ''),
-                "simple_method": full_data.get('simple_method', ''),
-                "simple_method_en": full_data.get('simple_method_en', ''),
-                "anatomical": full_data.get('anatomical', ''),
-                "caution": full_data.get('caution', ''),
+                standard_location=full_data.get('standard_location', ''),
+                standard_location_en=full_data.get('standard_location_en', ''),
+                simple_method=full_data.get('simple_method', ''),
+                simple_method_en=full_data.get('simple_method_en', ''),
+                anatomical=full_data.get('anatomical', ''),
+                caution=full_data.get('caution', ''),
                 # Image sources
-                "image_sources": full_data.get('image_sources', [])
-            })
+                image_sources=tuple(full_data.get('image_sources', ()))
+            ))
         else:
             # Fallback if we don't have detailed data
-            enriched_points.append({
-                "code": point['code'],
-                "name": point['name'],
-                "meridian": point['meridian'],
-                "basic_hint": point['location_hint'],
-                "notes": point.get('notes', ''),
-                "image_sources": [
-                    {
-                        "name": "Google Images",
-                        "url": f"https://www.google.com/search?tbm=isch&q={point['code']}+{point['name']}+acupoint+location",
-                        "type": "image_search"
-                    }
-                ]
-            })
+            enriched_points.append(EnrichedPoint(
+                code=point['code'],
+                name=point['name'],
+                meridian=point['meridian'],
+                basic_hint=point['location_hint'],
+                notes=point.get('notes', ''),
+                image_sources=tuple(fallback_image_sources(point['code'], point['name'])),
+                **_NO_DETAILS
+            ))
 
     return {
         "success": True,
         "symptom": symptom_entry['symptom'],
         "sources": symptom_entry.get('sources', []),
-        "acupoints": enriched_points,
+        "acupoints": tuple(enriched_points),
         "disclaimer": db.get('disclaimer', 'For educational reference only.')
     }
 
 
-def format_diagnosis(result: Dict) -> str:
+# (line prefix, point key) for the optional lines of the 定位 section, in display order
+_LOCATION_FIELDS = (
+    ("   标准: ", "standard_location"),
+    ("   EN: ", "standard_location_en"),
+)
+
+
+def format_diagnosis(result: dict) -> str:
     """Format diagnosis result for terminal display"""
+    return "\n".join(_diagnosis_lines(result))
+
+
+def _diagnosis_lines(result: dict) -> Iterator[str]:
+    """Yield the display lines of a diagnosis result"""
     if not result['success']:
-        output = [f"\n❌ {result['error']}\n"]
-        output.append("Available symptoms:")
+        yield f"\n❌ {result['error']}\n"
+        yield "Available symptoms:"
         for s in result['available_symptoms']:
-            output.append(f"  • {s}")
-        return "\n".join(output)
+            yield f"  • {s}"
+        return
 
-    output = []
-    output.append(f"\n{'='*70}")
-    output.append(f"🩺 症状诊断: {result['symptom']}")
-    output.append(f"{'='*70}")
+    yield f"\n{'='*70}"
+    yield f"🩺 症状诊断: {result['symptom']}"
+    yield f"{'='*70}"
 
     for i, point in enumerate(result['acupoints'], 1):
-        output.append(f"\n{'─'*70}")
-        output.append(f"【穴位 {i}】{point['code']} - {point.get('chinese_name', '')} ({point['name']})")
-        output.append(f"经络: {point['meridian']}")
-
-        if point.get('caution'):
-            output.append(f"⚠️  注意: {point['caution']}")
-
-        output.append(f"\n📍 定位:")
-        if point.get('standard_location'):
-            output.append(f"   标准: {point['standard_location']}")
-        if point.get('standard_location_en'):
-            output.append(f"   EN: {point['standard_location_en']}")
-
-        output.append(f"\n👆 简便取穴:")
-        if point.get('simple_method'):
-            output.append(f"   {point['simple_method']}")
-        if point.get('simple_method_en'):
-            output.append(f"   {point['simple_method_en']}")
-        elif point.get('basic_hint'):
-            output.append(f"   {point['basic_hint']}")
-
-        if point.get('notes'):
-            output.append(f"\n💡 提示: {point['notes']}")
-
-        output.append(f"\n🖼️ 图片资源 (点击查看位置):")
-        for j, src in enumerate(point.get('image_sources', [])[:5], 1):  # Show top 5
-            output.append(f"   {j}. [{src['name']}] {src['url']}")
+        yield f"\n{'─'*70}"
+        yield f"【穴位 {i}】{point['code']} - {point.get('chinese_name', '')} ({point['name']})"
+        yield f"经络: {point['meridian']}"
 
-    output.append(f"\n{'='*70}")
-    output.append(f"⚠️  {result['disclaimer']}")
-    output.append(f"{'='*70}\n")
+        if caution := point.get('caution'):
+            yield f"⚠️  注意: {caution}"
 
-    return "\n".join(output)
+        yield "\n📍 定位:"
+        for prefix, key in _LOCATION_FIELDS:
+            if value := point.get(key):
+                yield prefix + value
 
+        yield "\n👆 简便取穴:"
+        if value := point.get('simple_method'):
+            yield f"   {value}"
+        # The English method, or the symptom database's hint when there is none
+        if value := point.get('simple_method_en') or point.get('basic_hint'):
+            yield f"   {value}"
+
+        if notes := point.get('notes'):
+            yield f"\n💡 提示: {notes}"
+
+        yield f"\n🖼️ 图片资源 (点击查看位置):"
+        for j, src in enumerate(point.get('image_sources', [])[:5], 1):  # Show top 5
+            yield f"   {j}. [{src['name']}] {src['url']}"
 
-def list_symptoms(db: Dict) -> str:
+    yield f"\n{'='*70}"
+    yield f"⚠️  {result['disclaimer']}"
+    yield f"{'='*70}\n"
+
+
+def list_symptoms(db: dict) -> str:
     """List all available symptoms"""
+    return format_symptom_names(s['symptom'] for s in db['symptoms'])
+
+
+def format_symptom_names(names: Iterable[str]) -> str:
+    """Format a numbered symptom list"""
     output = ["\n📋 可查询症状列表:\n"]
-    for i, s in enumerate(db['symptoms'], 1):
-        output.append(f"  {i}. {s['symptom']}")
+    for i, name in enumerate(names, 1):
+        output.append(f"  {i}. {name}")
     return "\n".join(output)
 
 
+def iter_symptom_names() -> Iterator[str]:
+    """Yield the symptom names, streamed from the file without building the full tree if ijson is installed"""
+    if ijson is None:
+        for s in load_symptom_database()['symptoms']:
+            yield s['symptom']
+        return
+    with open(SYMPTOM_DB_PATH, 'rb') as f:
+        yield from ijson.items(f, 'symptoms.item.symptom')
+
+
+def file_has_content(path: str, data: bytes) -> bool:
+    """True if the file at path already holds exactly data"""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+USAGE = """Usage: python symptom_diagnosis.py <SYMPTOM>
+       python symptom_diagnosis.py --list
+
+Examples:
+  python symptom_diagnosis.py 'low back pain'
+  python symptom_diagnosis.py headache
+  python symptom_diagnosis.py nausea
+"""
+
+
 def main():
+    # Output is collected and written to stdout once, instead of print() per line
     if len(sys.argv) < 2:
-        print("Usage: python symptom_diagnosis.py <SYMPTOM>")
-        print("       python symptom_diagnosis.py --list")
-        print("\nExamples:")
-        print("  python symptom_diagnosis.py 'low back pain'")
-        print("  python symptom_diagnosis.py headache")
-        print("  python symptom_diagnosis.py nausea")
+        sys.stdout.write(USAGE)
         return
 
     query = sys.argv[1]
 
     if query == "--list":
-        db = load_symptom_database()
-        print(list_symptoms(db))
+        sys.stdout.write(format_symptom_names(iter_symptom_names()) + "\n")
         return
 
     result = diagnose(query)
-    print(format_diagnosis(result))
-
-    # Save JSON output
-    if result['success']:
-        output_file = f"diagnosis_{query.replace(' ', '_').replace('/', '_')}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-        print(f"✅ JSON saved to: {output_file}")
+    output = [format_diagnosis(result), "\n"]
+
+    try:
+        # Save JSON output
+        if result['success']:
+            output_file = f"diagnosis_{query.replace(' ', '_').replace('/', '_')}.json"
+            if orjson is not None:
+                data = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(result, ensure_ascii=False, indent=2).encode('utf-8')
+            if file_has_content(output_file, data):
+                output.append(f"✅ JSON unchanged: {output_file}\n")
+            else:
+                # Write to a temp file and rename it into place, so an
+                # interrupted run never leaves a half-written file behind
+                tmp_file = output_file + ".tmp"
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_file, output_file)
+                output.append(f"✅ JSON saved to: {output_file}\n")
+    finally:
+        sys.stdout.write("".join(output))
 
 
 if __name__ == "__main__":